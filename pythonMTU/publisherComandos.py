@@ -0,0 +1,176 @@
+import os
+import sys
+import time
+import itertools
+import socket
+import threading
+from paho.mqtt import client as mqtt_client
+
+from topicos import SEDES, PISOS
+
+# Datos del servidor Mosquitto
+broker = os.environ.get('MTU_BROKER', '172.16.48.92')
+port = int(os.environ.get('MTU_PORT', 1883))
+# Hostname + pid: en contenedores el pid suele ser 1 en todos. También es el
+# prefijo de los ids de comando, así cada publicador reconoce sus ACKs.
+client_id = os.environ.get('MTU_CLIENT_ID', f'comandos-{socket.gethostname()}-{os.getpid()}')
+username = 'mtuuser'
+password = 'amerike'
+
+# Protocolo de comandos (un mensaje por piso):
+#   {sede}/{piso}/cmd      CMD:<id>:<destino>:led_ultra=1,led3=0,buzzer=1
+#   {sede}/{piso}/cmd/ack  ACK:<id>:<dispositivo>
+# destino '*' = todos los dispositivos del piso
+topic_ack = '+/+/cmd/ack'
+ACTUADORES = ['led_ultra', 'buzzer'] + [f'led{i}' for i in range(1, 11)]
+
+# Ventana de agrupación: dentro de ella gana el último valor por actuador
+ventana = float(os.environ.get('MTU_VENTANA', 0.2))
+
+def validar(sede, piso, actuador, valor):
+    """Lanza ValueError si el comando no puede aplicarse en el dispositivo"""
+    if sede not in SEDES:
+        raise ValueError(f"Sede desconocida: {sede}")
+    if piso not in PISOS:
+        raise ValueError(f"Piso desconocido: {piso}")
+    if actuador not in ACTUADORES:
+        raise ValueError(f"Actuador desconocido: {actuador}")
+    if str(valor) not in ('0', '1'):
+        raise ValueError(f"Valor inválido para {actuador}: '{valor}' (debe ser 0 o 1)")
+
+def expandir_destino(destino):
+    """'amerikeCDMX/P1', 'amerikeCDMX/*' o '*/*' -> lista de (sede, piso)"""
+    sede, _, piso = destino.partition('/')
+    sedes = list(SEDES) if sede == '*' else [sede]
+    pisos = PISOS if piso in ('*', '') else [piso]
+    return [(s, p) for s in sedes for p in pisos]
+
+class Comandos:
+    """Agrupa comandos por piso y los publica una vez por ventana"""
+
+    def __init__(self, client):
+        self.client = client
+        self.lock = threading.Lock()
+        self.pendientes = {}   # (sede, piso) -> {actuador: valor}
+        self.enviados = {}     # id -> instante de publicación
+        self.latencias = []
+        self.ids = itertools.count(1)
+        self.activo = True
+        self.hilo = threading.Thread(target=self._loop, daemon=True)
+
+    def start(self):
+        self.hilo.start()
+
+    def stop(self):
+        self.activo = False
+        self.hilo.join()
+        self.flush()
+
+    def enviar(self, sede, piso, actuador, valor):
+        validar(sede, piso, actuador, valor)
+        with self.lock:
+            self.pendientes.setdefault((sede, piso), {})[actuador] = str(valor)
+
+    def flush(self):
+        with self.lock:
+            pendientes, self.pendientes = self.pendientes, {}
+        for (sede, piso), valores in pendientes.items():
+            cmd_id = f'{client_id}.{next(self.ids)}'
+            cuerpo = ','.join(f'{a}={v}' for a, v in valores.items())
+            mensaje = f'CMD:{cmd_id}:*:{cuerpo}'
+            topic = f'{sede}/{piso}/cmd'
+            self.enviados[cmd_id] = time.perf_counter()
+            result = self.client.publish(topic, mensaje, qos=1)
+            if result[0] == 0:
+                print(f"📤 Enviado: '{mensaje}' al topic '{topic}'")
+            else:
+                print(f"⚠️ Error al enviar '{mensaje}' al topic '{topic}'")
+
+    def _loop(self):
+        while self.activo:
+            time.sleep(ventana)
+            self.flush()
+
+    def on_ack(self, client, userdata, msg):
+        recibido = time.perf_counter()
+        try:
+            _, cmd_id, dispositivo = msg.payload.decode().split(':', 2)
+        except ValueError:
+            print(f"⚠️ ACK inválido en '{msg.topic}': {msg.payload!r}")
+            return
+        enviado = self.enviados.get(cmd_id)
+        if enviado is None:
+            return  # ACK de otro publicador
+        ms = (recibido - enviado) * 1000
+        self.latencias.append(ms)
+        print(f"⏱️ ACK {cmd_id} de {dispositivo}: {ms:.1f} ms")
+
+    def resumen(self):
+        if not self.latencias:
+            print("⚠️ No se recibieron ACKs")
+            return
+        lat = sorted(self.latencias)
+        print(f"📊 {len(lat)} ACKs - min {lat[0]:.1f} ms, "
+              f"prom {sum(lat) / len(lat):.1f} ms, max {lat[-1]:.1f} ms")
+
+def connect_mqtt(suscrito):
+    def on_connect(client, userdata, flags, rc):
+        if rc == 0:
+            print("✅ Conectado al broker MQTT")
+            client.subscribe(topic_ack, qos=1)
+        else:
+            print(f"❌ Error de conexión, código {rc}")
+
+    def on_subscribe(client, userdata, mid, granted_qos):
+        # Ya llegó el SUBACK de los ACKs: se puede empezar a publicar
+        suscrito.set()
+
+    client = mqtt_client.Client(client_id)
+    client.username_pw_set(username, password)
+    client.on_connect = on_connect
+    client.on_subscribe = on_subscribe
+    client.connect(broker, port)
+    return client
+
+def run():
+    # Uso: publisherComandos.py <sede>/<piso> actuador=valor [actuador=valor ...]
+    if len(sys.argv) < 3:
+        print(f"Uso: {sys.argv[0]} <sede>/<piso|*> actuador=valor ...")
+        print(f"Actuadores: {', '.join(ACTUADORES)}")
+        sys.exit(1)
+
+    # Se valida todo antes de conectarse al broker
+    lote = []
+    try:
+        for sede, piso in expandir_destino(sys.argv[1]):
+            for par in sys.argv[2:]:
+                actuador, _, valor = par.partition('=')
+                validar(sede, piso, actuador, valor)
+                lote.append((sede, piso, actuador, valor))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    suscrito = threading.Event()
+    client = connect_mqtt(suscrito)
+    comandos = Comandos(client)
+    client.on_message = comandos.on_ack
+    client.loop_start()
+
+    # Sin la suscripción a los ACKs confirmada se perderían las primeras respuestas
+    if not suscrito.wait(timeout=5):
+        print("❌ No se confirmó la suscripción a los ACKs")
+        client.loop_stop()
+        sys.exit(1)
+
+    comandos.start()
+    for comando in lote:
+        comandos.enviar(*comando)
+
+    time.sleep(float(os.environ.get('MTU_ESPERA_ACK', 3)))  # espera los ACKs
+    comandos.stop()
+    client.loop_stop()
+    comandos.resumen()
+
+if __name__ == '__main__':
+    run()
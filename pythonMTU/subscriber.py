@@ -1,91 +1,124 @@
-import random
-from paho.mqtt import client as mqtt_client
-
-# Datos del servidor Mosquitto
-broker = '172.16.48.92'
-port = 1883
-client_id = f'subscriber-{random.randint(0, 1000)}'
-
-# Lista sede/piso/sensor
-opciones = {
-    # -------- CDMX --------
-    '1':  ('amerikeCDMX/PB/temp', 'CDMX PB - Temperatura'),
-    '2':  ('amerikeCDMX/PB/hum', 'CDMX PB - Humedad'),
-    '3':  ('amerikeCDMX/PB/rfid', 'CDMX PB - RFID autorizado'),
-    '4':  ('amerikeCDMX/PB/rfid/denegado', 'CDMX PB - RFID denegado'),
-    '5':  ('amerikeCDMX/PB/otros', 'CDMX PB - Otros sensores'),
-
-    '6':  ('amerikeCDMX/P1/temp', 'CDMX P1 - Temperatura'),
-    '7':  ('amerikeCDMX/P1/hum', 'CDMX P1 - Humedad'),
-    '8':  ('amerikeCDMX/P1/rfid', 'CDMX P1 - RFID autorizado'),
-    '9':  ('amerikeCDMX/P1/rfid/denegado', 'CDMX P1 - RFID denegado'),
-    '10': ('amerikeCDMX/P1/otros', 'CDMX P1 - Otros sensores'),
-
-    '11': ('amerikeCDMX/P2/temp', 'CDMX P2 - Temperatura'),
-    '12': ('amerikeCDMX/P2/hum', 'CDMX P2 - Humedad'),
-    '13': ('amerikeCDMX/P2/rfid', 'CDMX P2 - RFID autorizado'),
-    '14': ('amerikeCDMX/P2/rfid/denegado', 'CDMX P2 - RFID denegado'),
-    '15': ('amerikeCDMX/P2/otros', 'CDMX P2 - Otros sensores'),
-
-    # -------- GDJ --------
-    '16': ('amerikeGDJ/PB/temp', 'GDJ PB - Temperatura'),
-    '17': ('amerikeGDJ/PB/hum', 'GDJ PB - Humedad'),
-    '18': ('amerikeGDJ/PB/rfid', 'GDJ PB - RFID autorizado'),
-    '19': ('amerikeGDJ/PB/rfid/denegado', 'GDJ PB - RFID denegado'),
-    '20': ('amerikeGDJ/PB/otros', 'GDJ PB - Otros sensores'),
-
-    '21': ('amerikeGDJ/P1/temp', 'GDJ P1 - Temperatura'),
-    '22': ('amerikeGDJ/P1/hum', 'GDJ P1 - Humedad'),
-    '23': ('amerikeGDJ/P1/rfid', 'GDJ P1 - RFID autorizado'),
-    '24': ('amerikeGDJ/P1/rfid/denegado', 'GDJ P1 - RFID denegado'),
-    '25': ('amerikeGDJ/P1/otros', 'GDJ P1 - Otros sensores'),
-
-    '26': ('amerikeGDJ/P2/temp', 'GDJ P2 - Temperatura'),
-    '27': ('amerikeGDJ/P2/hum', 'GDJ P2 - Humedad'),
-    '28': ('amerikeGDJ/P2/rfid', 'GDJ P2 - RFID autorizado'),
-    '29': ('amerikeGDJ/P2/rfid/denegado', 'GDJ P2 - RFID denegado'),
-    '30': ('amerikeGDJ/P2/otros', 'GDJ P2 - Otros sensores'),
-}
-
-# Mostrar menú
-print("Selecciona el topic al que deseas suscribirte:\n")
-for k, v in opciones.items():
-    print(f"{k}. {v[1]}")
-
-opcion = input("\nIngresa el número de opción: ").strip()
-
-if opcion not in opciones:
-    print("❌ Opción inválida.")
-    exit(1)
-
-topic = opciones[opcion][0]
-print(f"\n📡 Suscrito a: {topic} - {opciones[opcion][1]}")
+import time
+
+# Marca de inicio para medir el arranque (import → SUBACK del broker)
+inicio = time.perf_counter()
+
+import os
+import sys
+import socket
+
+from topicos import generar_topics
+
+# Datos del servidor Mosquitto (se pueden cambiar con MTU_BROKER / MTU_PORT)
+broker = os.environ.get('MTU_BROKER', '172.16.48.92')
+port = int(os.environ.get('MTU_PORT', 1883))
+# Hostname + pid: en contenedores el pid suele ser 1 en todos
+client_id = os.environ.get('MTU_CLIENT_ID', f'subscriber-{socket.gethostname()}-{os.getpid()}')
+
+def obtener_opciones():
+    """Numera la tabla sede/piso/sensor igual que el menú original (1..30)"""
+    return {str(i): t for i, t in enumerate(generar_topics(), start=1)}
+
+def resolver_topics(selecciones, opciones):
+    """Convierte números de opción o topics literales en la lista de topics"""
+    topics = []
+    for s in selecciones:
+        s = s.strip()
+        if not s:
+            continue
+        if s in opciones:
+            topics.append(opciones[s][0])
+        elif '/' in s:
+            topics.append(s)
+        else:
+            raise ValueError(f"Opción inválida: {s}")
+    return topics
+
+def mostrar_menu(opciones):
+    print("Selecciona el topic al que deseas suscribirte:\n")
+    for k, v in opciones.items():
+        print(f"{k}. {v[1]}")
+
+def parse_args(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Subscriber MQTT por sede/piso/sensor")
+    parser.add_argument('topics', nargs='*',
+                        help="números de opción (ver --listar) o topics MQTT; "
+                             "por defecto MTU_TOPICS (separados por coma)")
+    parser.add_argument('--broker', default=broker)
+    parser.add_argument('--port', type=int, default=port)
+    parser.add_argument('--listar', action='store_true', help="muestra la tabla de topics y termina")
+    return parser.parse_args(argv)
 
 # Conexión al broker
-def connect_mqtt():
+def connect_mqtt(host, puerto):
+    from paho.mqtt import client as mqtt_client
+
     def on_connect(client, userdata, flags, rc):
         if rc == 0:
             print("✅ Conectado al broker MQTT")
+            # Se suscribe en cada conexión para recuperar los topics
+            # después de un reinicio del broker
+            if userdata:
+                client.subscribe([(t, 0) for t in userdata])
         else:
             print(f"❌ Error de conexión, código {rc}")
 
     client = mqtt_client.Client(client_id)
     client.username_pw_set("mtuuser", "amerike")
     client.on_connect = on_connect
-    client.connect(broker, port)
+    client.connect(host, puerto)
     return client
 
 # Lógica de suscripción
-def subscribe(client):
+def subscribe(client, topics):
     def on_message(client, userdata, msg):
         print(f"📥 Mensaje recibido: '{msg.payload.decode()}' del topic '{msg.topic}'")
 
-    client.subscribe(topic)
-    client.on_message = on_message
+    medido = False
 
-def run():
-    client = connect_mqtt()
-    subscribe(client)
+    def on_subscribe(client, userdata, mid, granted_qos):
+        # Solo se mide la primera suscripción (arranque en frío)
+        nonlocal medido
+        if not medido:
+            medido = True
+            print(f"⏱️ Arranque: {(time.perf_counter() - inicio) * 1000:.1f} ms hasta SUBACK")
+
+    # La suscripción se envía en on_connect
+    client.user_data_set(topics)
+    client.on_message = on_message
+    client.on_subscribe = on_subscribe
+
+def run(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    opciones = obtener_opciones()
+
+    if args.listar:
+        for k, v in opciones.items():
+            print(f"{k}. {v[0]} - {v[1]}")
+        return
+
+    selecciones = args.topics or os.environ.get('MTU_TOPICS', '').split(',')
+    try:
+        topics = resolver_topics(selecciones, opciones)
+        # Sin argumentos ni entorno solo se pregunta si hay una terminal
+        if not topics and sys.stdin.isatty():
+            mostrar_menu(opciones)
+            topics = resolver_topics([input("\nIngresa el número de opción: ")], opciones)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if not topics:
+        print("❌ No se indicó ningún topic (argumentos o MTU_TOPICS).")
+        sys.exit(1)
+
+    for t in topics:
+        print(f"📡 Suscrito a: {t}")
+
+    client = connect_mqtt(args.broker, args.port)
+    subscribe(client, topics)
     client.loop_forever()
 
 if __name__ == '__main__':
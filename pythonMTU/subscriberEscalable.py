@@ -0,0 +1,196 @@
+import os
+import sys
+import time
+import signal
+import socket
+import multiprocessing as mp
+from paho.mqtt import client as mqtt_client
+
+from topicos import generar_topics
+
+# Datos del servidor Mosquitto (se pueden cambiar con MTU_BROKER / MTU_PORT)
+broker = os.environ.get('MTU_BROKER', '172.16.48.92')
+port = int(os.environ.get('MTU_PORT', 1883))
+username = 'mtuuser'
+password = 'amerike'
+
+# Número de workers (por defecto uno por núcleo) y modo de suscripción.
+# Con MTU_SHARE=1 cada worker usa suscripciones compartidas ($share/...).
+# Varios supervisores pueden compartir el grupo (cada uno con su MTU_NODO),
+# pero entonces se pierde el orden por topic.
+workers = int(os.environ.get('MTU_WORKERS', os.cpu_count() or 1))
+usar_share = os.environ.get('MTU_SHARE', '0') == '1'
+grupo = os.environ.get('MTU_GRUPO', 'subscribers')
+# Identifica a este supervisor dentro del grupo (distinto por supervisor)
+nodo = os.environ.get('MTU_NODO', socket.gethostname())
+espera_stop = 5  # segundos para que un worker termine antes de matarlo
+
+# Cada topic se asigna siempre al mismo worker, así un único proceso
+# recibe todos los mensajes de ese topic y se conserva su orden. Se reparte
+# por posición en la tabla (que es fija) para que la carga quede pareja.
+def asignar_topics(topics, indice, total):
+    return [t for i, t in enumerate(topics) if i % total == indice]
+
+def con_prefijo(topics):
+    return [f'$share/{grupo}/{t}' for t in topics] if usar_share else topics
+
+def connect_mqtt(client_id):
+    def on_connect(client, userdata, flags, rc):
+        if rc == 0:
+            print(f"✅ [{client_id}] Conectado al broker MQTT")
+            # Se re-suscribe en cada reconexión. La sesión es persistente y
+            # puede traer topics de un reparto anterior: se quitan los ajenos.
+            propios, ajenos = userdata
+            if propios:
+                client.subscribe([(t, 1) for t in propios])
+            if ajenos:
+                client.unsubscribe(ajenos)
+        else:
+            print(f"❌ [{client_id}] Error de conexión, código {rc}")
+
+    # Sesión persistente + QoS 1: el broker guarda los mensajes mientras el
+    # worker de ese slot se reinicia o se rebalancea.
+    client = mqtt_client.Client(client_id, clean_session=False)
+    client.username_pw_set(username, password)
+    client.on_connect = on_connect
+    client.connect(broker, port)
+    return client
+
+def id_slot(indice):
+    return f'subscriber-{grupo}-{nodo}-w{indice}'
+
+def descartar_sesion(indice):
+    """Borra en el broker la sesión de un slot que ya no se usa"""
+    client = mqtt_client.Client(id_slot(indice), clean_session=True)
+    client.username_pw_set(username, password)
+    try:
+        client.connect(broker, port)
+        client.loop(timeout=1)
+        client.disconnect()
+    except Exception as e:
+        print(f"⚠️ No se pudo descartar la sesión de {id_slot(indice)}: {e}")
+
+def descartar_sesiones(desde):
+    """Borra las sesiones de slots >= desde que pudo dejar una ejecución
+    anterior con más workers. Solo los slots < número de topics llegan a
+    tener suscripciones, así que no hace falta recordar el total previo."""
+    for indice in range(desde, len(generar_topics())):
+        descartar_sesion(indice)
+
+def worker(indice, total):
+    # El supervisor es quien decide cuándo detener a los workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_DFL)
+    signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+    signal.signal(signal.SIGUSR2, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    # Id fijo por slot: el broker conserva su sesión entre reinicios
+    client_id = id_slot(indice)
+    todos = [t for t, _ in generar_topics()]
+    propios = asignar_topics(todos, indice, total)
+    ajenos = [t for t in todos if t not in propios]
+
+    def on_message(client, userdata, msg):
+        print(f"📥 [w{indice}] Recibido '{msg.payload.decode()}' del topic '{msg.topic}'")
+
+    client = connect_mqtt(client_id)
+    client.user_data_set((con_prefijo(propios), con_prefijo(ajenos)))
+    client.on_message = on_message
+    print(f"📡 [{client_id}] {len(propios)} topics: {', '.join(propios)}")
+    client.loop_forever()
+
+class Supervisor:
+    """Mantiene N workers vivos y reparte los topics cuando N cambia.
+
+    Señales:
+    - SIGUSR1 / SIGUSR2: agrega / quita un worker
+    - SIGHUP: vuelve a leer MTU_WORKERS del archivo indicado en MTU_WORKERS_FILE
+    - SIGINT / SIGTERM: detiene todos los workers y termina
+    """
+
+    def __init__(self, total):
+        self.total = max(1, total)
+        self.deseado = self.total
+        self.procesos = {}
+        self.activo = True
+
+    def iniciar_worker(self, indice):
+        p = mp.Process(target=worker, args=(indice, self.total), name=f'worker-{indice}')
+        p.start()
+        self.procesos[indice] = p
+
+    def detener_workers(self):
+        for p in self.procesos.values():
+            p.terminate()
+        for indice, p in self.procesos.items():
+            p.join(espera_stop)
+            if p.is_alive():
+                print(f"⚠️ Worker {indice} no terminó, forzando cierre...")
+                p.kill()
+                p.join()
+        self.procesos = {}
+
+    def rebalancear(self):
+        # Se detienen todos antes de arrancar el nuevo reparto para que
+        # ningún topic tenga dos consumidores al mismo tiempo. Mientras tanto
+        # el broker encola en las sesiones de los slots anteriores; al quitar
+        # workers, lo encolado para los slots retirados se descarta.
+        print(f"🔁 Rebalanceando: {self.total} → {self.deseado} workers")
+        self.detener_workers()
+        for indice in range(self.deseado, self.total):
+            descartar_sesion(indice)
+        self.total = self.deseado
+        for indice in range(self.total):
+            self.iniciar_worker(indice)
+
+    def on_signal(self, signum, frame):
+        if signum == signal.SIGUSR1:
+            self.deseado += 1
+        elif signum == signal.SIGUSR2:
+            self.deseado = max(1, self.deseado - 1)
+        elif signum == signal.SIGHUP:
+            archivo = os.environ.get('MTU_WORKERS_FILE')
+            if archivo:
+                try:
+                    with open(archivo) as f:
+                        self.deseado = max(1, int(f.read().strip()))
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ No se pudo leer {archivo}: {e}")
+        else:
+            self.activo = False
+
+    def run(self):
+        for s in (signal.SIGUSR1, signal.SIGUSR2, signal.SIGHUP, signal.SIGINT, signal.SIGTERM):
+            signal.signal(s, self.on_signal)
+
+        descartar_sesiones(self.total)
+        for indice in range(self.total):
+            self.iniciar_worker(indice)
+        print(f"🚀 Supervisor iniciado con {self.total} workers (pid {os.getpid()})")
+
+        while self.activo:
+            if self.deseado != self.total:
+                self.rebalancear()
+            # Reinicia los workers caídos con la misma asignación
+            for indice, p in list(self.procesos.items()):
+                if not p.is_alive():
+                    print(f"⚠️ Worker {indice} terminó (código {p.exitcode}), reiniciando...")
+                    p.join()
+                    self.iniciar_worker(indice)
+            time.sleep(1)
+
+        print("🛑 Deteniendo workers...")
+        self.detener_workers()
+
+def run():
+    # Uso: subscriberEscalable.py [workers]
+    try:
+        total = int(sys.argv[1]) if len(sys.argv) > 1 else workers
+    except ValueError:
+        print(f"Uso: {sys.argv[0]} [workers]  (número entero, por defecto MTU_WORKERS o núcleos)")
+        sys.exit(1)
+    Supervisor(total).run()
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,28 @@
+# Tabla de topics generada a partir de las dimensiones sede × piso × sensor.
+# Debe coincidir con los topics que publica el MTU (nodeMQTT/index.js).
+
+# Sede -> nombre corto para descripciones
+SEDES = {
+    'amerikeCDMX': 'CDMX',
+    'amerikeGDJ': 'GDJ',
+}
+
+PISOS = ['PB', 'P1', 'P2']
+
+# Sufijo del topic -> descripción
+SENSORES = [
+    ('temp', 'Temperatura'),
+    ('hum', 'Humedad'),
+    ('rfid', 'RFID autorizado'),
+    ('rfid/denegado', 'RFID denegado'),
+    ('otros', 'Otros sensores'),
+]
+
+def generar_topics():
+    """Devuelve la lista [(topic, descripcion), ...] en orden sede, piso, sensor"""
+    return [
+        (f'{sede}/{piso}/{sensor}', f'{corto} {piso} - {descripcion}')
+        for sede, corto in SEDES.items()
+        for piso in PISOS
+        for sensor, descripcion in SENSORES
+    ]
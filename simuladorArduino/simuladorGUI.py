@@ -14,6 +14,9 @@ Este programa permite controlar y monitorear diversos sensores y actuadores IoT:
 Los datos se envían cada 2 segundos por puerto serial en formato CSV:
 sonico,fotoresistencia,temperatura,humedad,led_ultra,leds_binario,buzzer,rfid
 
+Si paho-mqtt está instalado, también recibe comandos para los actuadores
+en el topic {SEDE}/{PISO}/cmd y confirma cada uno en {SEDE}/{PISO}/cmd/ack.
+
 Autor: Amerike6oSemestre
 Versión: 1.0
 Fecha: 28 Mayo de 2025
@@ -25,12 +28,20 @@ import serial
 import threading
 import queue
 import time
+import os
+import socket
 
 # ===================== CONFIGURACIÓN INICIAL =====================
 # Configuración del puerto serial (ajustar según necesidad)
 SERIAL_PORT = '/dev/pts/5'    # Puerto serial de salida de datos
 BAUD_RATE = 9600        # Velocidad en baudios
 
+# Canal de comandos MQTT (mismos valores que nodeMQTT/.env)
+MQTT_BROKER = os.environ.get('MTU_BROKER', '172.16.48.92')
+MQTT_PORT = int(os.environ.get('MTU_PORT', 1883))
+SEDE = os.environ.get('SEDE', 'amerikeCDMX')
+PISO = os.environ.get('PISO', 'P1')
+
 class EnhancedSensorUI:
     """Clase principal que maneja la interfaz gráfica y la lógica de control"""
     
@@ -78,6 +89,7 @@ class EnhancedSensorUI:
         
         # ========== CONFIGURACIÓN ADICIONAL ==========
         self.setup_tooltips()      # Tooltips para controles
+        self.setup_command_channel() # Recepción de comandos por MQTT
         self.root.after(100, self.process_updates) # Inicia el procesamiento de actualizaciones
 
     # ===================== MÉTODOS DE CONFIGURACIÓN =====================
@@ -297,6 +309,37 @@ class EnhancedSensorUI:
         self.create_tooltip(self.led_canvas, "Estado del LED Ultra Brillante (controlado por fotoresistencia)")
         self.create_tooltip(self.buzzer_btn, "Activa/desactiva el buzzer")
     
+    def setup_command_channel(self):
+        """Se suscribe al topic de comandos del piso (opcional, requiere paho-mqtt)"""
+        self.mqtt_client = None
+        try:
+            from paho.mqtt import client as mqtt_client
+        except ImportError:
+            self.log_action("paho-mqtt no instalado - canal de comandos desactivado")
+            return
+        
+        self.device_id = f"sim-{SEDE}-{PISO}-{socket.gethostname()}-{os.getpid()}"
+        self.cmd_topic = f"{SEDE}/{PISO}/cmd"
+        
+        def on_connect(client, userdata, flags, rc):
+            if rc == 0:
+                client.subscribe(self.cmd_topic, qos=1)
+                self.log_from_mqtt(f"Escuchando comandos en {self.cmd_topic}")
+            else:
+                self.log_from_mqtt(f"Error de conexión MQTT, código {rc}")
+        
+        client = mqtt_client.Client(self.device_id)
+        client.username_pw_set("mtuuser", "amerike")
+        client.on_connect = on_connect
+        client.on_message = self.on_command
+        try:
+            client.connect(MQTT_BROKER, MQTT_PORT)
+        except Exception as e:
+            self.log_action(f"No se pudo conectar al broker MQTT: {e}")
+            return
+        client.loop_start()
+        self.mqtt_client = client
+    
     # ===================== MÉTODOS DE FUNCIONALIDAD =====================
     
     def create_tooltip(self, widget, text):
@@ -455,6 +498,78 @@ class EnhancedSensorUI:
         
         self.log_action(f"Envio de datos {'ACTIVADO' if self.sending_active else 'DESACTIVADO'}")
     
+    def queue_from_mqtt(self, update_fn, description):
+        """Encola una actualización desde el hilo de MQTT sin bloquearlo nunca"""
+        try:
+            self.update_queue.put_nowait(update_fn)
+        except queue.Full:
+            print(f"Cola de UI llena, se descarta: {description}")
+    
+    def log_from_mqtt(self, message):
+        """Registra un evento desde el hilo de MQTT (ver queue_from_mqtt)"""
+        timestamp = time.strftime("%H:%M:%S")
+        message = f"[{timestamp}] {message}"
+        self.queue_from_mqtt(lambda: self._update_event_console(message), message)
+    
+    def on_command(self, client, userdata, msg):
+        """Recibe un comando (hilo de MQTT): CMD:<id>:<destino>:actuador=valor,..."""
+        try:
+            prefijo, cmd_id, destino, cuerpo = msg.payload.decode().split(':', 3)
+            valores = dict(par.split('=', 1) for par in cuerpo.split(','))
+        except ValueError:
+            self.log_from_mqtt(f"Comando inválido: {msg.payload!r}")
+            return
+        
+        if prefijo != "CMD" or destino not in ('*', self.device_id):
+            return
+        
+        # Los cambios a la interfaz se aplican en el hilo principal. Si la
+        # cola está llena el comando se descarta y, sin ACK, el publicador
+        # lo ve como no entregado.
+        self.queue_from_mqtt(lambda: self.apply_command(cmd_id, valores), f"comando {cmd_id}")
+    
+    def validate_command(self, actuador, valor):
+        """Devuelve el motivo de rechazo de actuador=valor, o None si es válido"""
+        if valor not in ('0', '1'):
+            return "valor inválido"
+        es_led = actuador.startswith('led') and actuador[3:].isdigit() and 1 <= int(actuador[3:]) <= 10
+        if actuador not in ('led_ultra', 'buzzer') and not es_led:
+            return "actuador desconocido"
+        if actuador == 'led_ultra' and valor == '1' and self.fotoresistencia.get() == 1:
+            return "fotoresistencia activa"
+        return None
+    
+    def apply_command(self, cmd_id, valores):
+        """Aplica los valores a los actuadores y envía el ACK (hilo principal)"""
+        # Ya estamos en el hilo principal: se escribe directo en la consola,
+        # un put() bloqueante en update_queue aquí congelaría la interfaz
+        timestamp = time.strftime("%H:%M:%S")
+        
+        # Se valida todo antes de aplicar: o se aplica completo o nada
+        errores = []
+        for actuador, valor in valores.items():
+            motivo = self.validate_command(actuador, valor)
+            if motivo:
+                errores.append(f"{actuador}={valor} ({motivo})")
+        if errores:
+            self._update_event_console(f"[{timestamp}] Comando {cmd_id} rechazado: {', '.join(errores)}")
+            return  # Sin ACK: no se aplicó nada
+        
+        for actuador, valor in valores.items():
+            valor = int(valor)
+            if actuador == 'led_ultra':
+                self.led_ultra.set(valor)
+                self.led_btn.config(state=tk.NORMAL if valor else tk.DISABLED)
+                self.update_led_display()
+            elif actuador == 'buzzer':
+                self.buzzer.set(valor)
+            else:
+                self.leds[int(actuador[3:]) - 1].set(valor)
+        
+        aplicados = ', '.join(f"{a}={v}" for a, v in valores.items())
+        self._update_event_console(f"[{timestamp}] Comando {cmd_id}: {aplicados}")
+        self.mqtt_client.publish(f"{self.cmd_topic}/ack", f"ACK:{cmd_id}:{self.device_id}", qos=1)
+    
     def process_updates(self):
         """Procesa las actualizaciones pendientes en la cola (ejecutado en el hilo principal)"""
         try:
@@ -477,6 +592,11 @@ class EnhancedSensorUI:
         except:
             pass
         
+        if self.mqtt_client:
+            # DISCONNECT se envía mientras el hilo de red sigue activo
+            self.mqtt_client.disconnect()
+            self.mqtt_client.loop_stop()
+        
         self.log_action("Aplicación detenida correctamente")
         self.root.after(1000, self.root.quit)  # Da tiempo a registrar el mensaje antes de cerrar
 